@@ -1,5 +1,31 @@
 import os
 
+# Accepted spellings for boolean settings
+_TRUTHY = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _env_bool(key, default='false'):
+    """
+    Returns bool value of environment variable key
+    """
+    return os.environ.get(key, default).lower() in _TRUTHY
+
+
+# Cached result of Docker detection
+_IS_DOCKER = None
+
+
+def _is_docker():
+    """
+    Returns True when running inside a Docker container
+
+    Checked once per process since the platform cannot change while running
+    """
+    global _IS_DOCKER
+    if _IS_DOCKER is None:
+        _IS_DOCKER = os.path.exists('/.dockerenv')
+    return _IS_DOCKER
+
 
 class ConfigManager(object):
     """
@@ -9,84 +35,111 @@ class ConfigManager(object):
     def __init__(self):
         """
         ConfigManager constructor - validates required environment variables
+
+        Environment variables do not change for the lifetime of the process,
+        so every setting is read once here and the getters return the cached
+        values.
         """
         # Check for required URL list
-        if not os.environ.get('URL_LIST'):
+        url_string = os.environ.get('URL_LIST', '')
+        if not url_string:
             print("WARNING: URL_LIST environment variable not set. Please set it to a comma-separated list of URLs to archive.")
 
+        # Split by comma, strip whitespace, filter out empty strings and
+        # drop duplicates while preserving order
+        urls = (url.strip() for url in url_string.split(','))
+        self._url_list = list(dict.fromkeys(url for url in urls if url))
+
+        self._skip_intro = _env_bool('SKIP_INTRO')
+
+        # Default to /archive for Docker, ~/JDAE_OUTPUT for local
+        self._output_dir = os.environ.get('OUTPUT_DIR')
+        if self._output_dir is None:
+            self._output_dir = '/archive' if _is_docker() else os.path.expanduser('~/JDAE_OUTPUT')
+
+        # Default to 6 hours
+        hours = float(os.environ.get('ARCHIVE_FREQUENCY_HOURS', '6'))
+        self._archive_freq = int(hours * 3600)
+
+        self._oauth = os.environ.get('SOUNDCLOUD_OAUTH', '')
+        self._hq_en = _env_bool('HIGH_QUALITY_ENABLE')
+        self._sleep_interval_requests = int(os.environ.get('RATE_LIMIT_SEC', '3'))
+        self._max_workers = max(1, int(os.environ.get('MAX_WORKERS', '1')))
+        self._listformats = _env_bool('LIST_FORMATS')
+        self._quiet = _env_bool('QUIET')
+        self._embed_metadata = _env_bool('EMBED_METADATA', 'true')
+        self._album_artist_override = os.environ.get('ALBUM_ARTIST_OVERRIDE', '')
+
     def get_url_list(self):
         """
         Returns list of URLs from environment variable
         Expects comma-separated list in URL_LIST env var
         """
-        url_string = os.environ.get('URL_LIST', '')
-        if not url_string:
-            return []
-        
-        # Split by comma and strip whitespace
-        urls = [url.strip() for url in url_string.split(',')]
-        # Filter out empty strings
-        return [url for url in urls if url]
+        return self._url_list
 
     def get_skip_intro(self):
         """
         Returns skip intro bool value
         """
-        val = os.environ.get('SKIP_INTRO', 'false').lower()
-        return val in ['true', '1', 'yes']
+        return self._skip_intro
 
     def get_output_dir(self):
         """
         Returns base directory for archive output
         """
-        # Default to /archive for Docker, ~/JDAE_OUTPUT for local
-        default = '/archive' if os.path.exists('/.dockerenv') else os.path.expanduser('~/JDAE_OUTPUT')
-        return os.environ.get('OUTPUT_DIR', default)
+        return self._output_dir
 
     def get_archive_freq(self):
         """
         Returns the number of seconds to wait between archive runs
         """
-        # Default to 6 hours
-        hours = float(os.environ.get('ARCHIVE_FREQUENCY_HOURS', '6'))
-        return int(hours * 3600)
+        return self._archive_freq
 
     def get_oauth(self):
         """
         Returns Soundcloud OAuth value to enable HQ downloads
         """
-        return os.environ.get('SOUNDCLOUD_OAUTH', '')
+        return self._oauth
 
     def get_hq_en(self):
         """
         Returns the True/False value for High Quality Enable
         """
-        val = os.environ.get('HIGH_QUALITY_ENABLE', 'false').lower()
-        return val in ['true', '1', 'yes']
+        return self._hq_en
 
     def get_sleep_interval_requests(self):
         """
         Returns rate limit delay in seconds between requests
         """
-        return int(os.environ.get('RATE_LIMIT_SEC', '3'))
+        return self._sleep_interval_requests
+
+    def get_max_workers(self):
+        """
+        Returns number of URLs to download in parallel
+        """
+        return self._max_workers
 
     def get_listformats(self):
         """
         Returns listformats bool value for debugging available formats
         """
-        val = os.environ.get('LIST_FORMATS', 'false').lower()
-        return val in ['true', '1', 'yes']
+        return self._listformats
+
+    def get_quiet(self):
+        """
+        Returns quiet bool value for suppressing per-url and per-file output
+        """
+        return self._quiet
 
     def get_embed_metadata(self):
         """
         Returns embed_metadata bool value for enabling metadata and thumbnail embedding
         """
-        val = os.environ.get('EMBED_METADATA', 'true').lower()
-        return val in ['true', '1', 'yes']
+        return self._embed_metadata
 
     def get_album_artist_override(self):
         """
         Returns album artist override value if set
         If set, this value will be used as album artist for all downloads
         """
-        return os.environ.get('ALBUM_ARTIST_OVERRIDE', '')
\ No newline at end of file
+        return self._album_artist_override
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import threading
+
+
+class DownloadArchive(set):
+    """
+    yt_dlp download archive shared by all worker threads
+
+    Passed to every yt_dlp instance as the download_archive option. yt_dlp
+    skips entries whose id is in the set and calls add() when a download is
+    recorded, which appends the id to the archive file. The file is only
+    read once, when the archive is created.
+    """
+
+    # Mode for a newly created archive file - only the owner may change
+    # which ids are skipped. Existing files keep their permissions.
+    FILE_MODE = 0o644
+
+    def __init__(self, path):
+        """
+        DownloadArchive constructor - loads ids already in the archive file
+        """
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Ids a worker has started downloading during the current pass
+        self._claimed = set()
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                super().update(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            pass
+
+    def add(self, vid_id):
+        """
+        Record a finished download in memory and in the archive file
+        """
+        with self._lock:
+            self._claimed.discard(vid_id)
+            if vid_id in self:
+                return
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, self.FILE_MODE)
+            with os.fdopen(fd, "a", encoding="utf-8") as f:
+                f.write(vid_id + "\n")
+            super().add(vid_id)
+
+    def match_filter(self, info_dict, incomplete=False):
+        """
+        yt_dlp match_filter that lets only one worker download each entry
+
+        Returns None to download the entry or the reason to skip it
+        """
+        # Entries are checked again with full info right before downloading
+        if incomplete:
+            return None
+
+        from yt_dlp.utils import make_archive_id
+
+        extractor = info_dict.get("extractor_key") or info_dict.get("ie_key")
+        video_id = info_dict.get("id")
+        if not extractor or not video_id:
+            return None
+
+        vid_id = make_archive_id(extractor, video_id)
+        with self._lock:
+            if vid_id in self or vid_id in self._claimed:
+                return f"{vid_id} is already archived or being downloaded by another worker"
+            self._claimed.add(vid_id)
+        return None
+
+    def release_claims(self):
+        """
+        Forget ids claimed during the last pass so failed downloads are retried
+        """
+        with self._lock:
+            self._claimed.clear()
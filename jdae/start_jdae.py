@@ -1,21 +1,18 @@
 # Standard imports
-import configparser
-import contextlib
-import glob
 import os
+import random
 import signal
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 # Package imports
 import jdae.src.logos as logos
 from jdae.src.configmanager import ConfigManager
-
-# 3rd Party imports
-import yt_dlp
-from mutagen.id3 import ID3, TPE2, COMM
-from mutagen.mp3 import MP3
+from jdae.src.downloadarchive import DownloadArchive
 
 
 class JDAE(object):
@@ -25,35 +22,107 @@ class JDAE(object):
     # Naming template for files output by downloader
     OUTPUT_FILE_TMPL = "%(title)s-%(uploader)s.%(ext)s"
 
+    # Number of threads used to rewrite ID3 tags
+    ID3_WORKERS = min(8, os.cpu_count() or 4)
+
+    # Bounds in seconds for the backoff applied after HTTP 429 responses
+    MIN_BACKOFF = 1.0
+    MAX_BACKOFF = 300.0
+
+    # yt_dlp options that do not depend on configuration
+    _BASE_YTDL_OPTS = {
+        "format": "ba[acodec!*=opus]",
+        "ignoreerrors": True,  # Continue on download errors
+        "extract_flat": "discard_in_playlist",  # Don't keep resolved playlist entries in memory
+        "concurrent_fragment_downloads": 4,  # Fetch HLS/DASH fragments in parallel
+        "http_chunk_size": 10 * 1024 * 1024,  # Download in 10MB chunks
+        "socket_timeout": 30,  # Drop stalled connections instead of hanging a worker
+    }
+
+    # Metadata mappings applied to every download
+    _BASE_PARSE_METADATA = (
+        # Artist is always the track uploader/creator
+        "%(artist|creator|uploader|uploader_id)s:%(artist)s",
+        # Map playlist name to album field
+        "%(playlist|playlist_title)s:%(album)s",
+        # Map description to comment field
+        "%(description)s:%(comment)s",
+        # Map the original webpage URL to author URL field
+        "%(webpage_url)s:%(author_url)s",
+    )
+
+    # Postprocessors when metadata embedding is enabled
+    # Convert to mp3 format for better compatibility
+    _PP_MP3 = (
+        {
+            "key": "FFmpegExtractAudio",
+            "preferredcodec": "mp3",
+            "preferredquality": "0",  # 0 means best quality (VBR)
+        },
+        {
+            "key": "FFmpegMetadata",
+            "add_metadata": True,
+        },
+        {
+            "key": "EmbedThumbnail",
+            "already_have_thumbnail": False,
+        },
+    )
+
     # Logger helper class
     class YTDLLogger(object):
         """
         Logger to print yt_dlp output
         """
 
-        print_flag = False
+        # Prefix of the download lines worth printing
+        _DOWNLOAD_PREFIX = "[download]"
+
+        # Marker yt_dlp includes in messages for rate limited requests
+        RATE_LIMIT_MARKER = "HTTP Error 429"
+
+        def __init__(self, quiet=False):
+            """
+            Constructor for YTDLLogger
+            """
+            # Suppress [download] progress lines
+            self.quiet = quiet
+
+            # Whether the line after a [download] line should be printed
+            self.print_flag = False
+
+            # Set once a rate limit response has been reported
+            self.rate_limited = False
+
+            # Bound once - debug runs for every line yt_dlp outputs
+            self._write = sys.stdout.write
 
         def debug(self, msg):
             """
             Print out relevant download information from yt_dlp
+
+            Prints each [download] line and the line that follows it
             """
-            if self.print_flag:
-                print(msg)
-                self.print_flag = False
-            elif msg.startswith("[download]"):
-                print(msg)
-                self.print_flag = True
+            if self.quiet:
+                return
+            if self.print_flag or msg[:10] == self._DOWNLOAD_PREFIX:
+                self._write(msg + "\n")
+                self.print_flag = not self.print_flag
 
         def warning(self, msg):
             """
             Print out warning messages from yt_dlp
             """
+            if self.RATE_LIMIT_MARKER in msg:
+                self.rate_limited = True
             print(f"Warning: {msg}")
 
         def error(self, msg):
             """
             Print out error messages from yt_dlp
             """
+            if self.RATE_LIMIT_MARKER in msg:
+                self.rate_limited = True
             print(f"Error: {msg}")
 
     def __init__(self):
@@ -61,7 +130,19 @@ class JDAE(object):
         Constructor for JDAE
         """
         self.cm = ConfigManager()
-        self.shutdown_requested = False
+        self.shutdown_event = threading.Event()
+
+        # Delay applied after the next rate limited url, and the monotonic
+        # time before which no worker may start a url. Shared by all workers.
+        self._backoff_s = self.MIN_BACKOFF
+        self._backoff_until = 0.0
+        self._backoff_lock = threading.Lock()
+
+        # Serializes workers loading and saving cookies.txt
+        self._cookie_lock = threading.Lock()
+
+        # Final paths of MP3s produced during the current archive pass
+        self._new_mp3s = []
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self.signal_handler)
@@ -70,44 +151,153 @@ class JDAE(object):
     def signal_handler(self, signum, frame):
         """
         Handle shutdown signals gracefully
+
+        A second signal exits immediately, since workers only notice the
+        shutdown at their next download progress update
         """
+        if self.shutdown_event.is_set():
+            print(f"\n\nReceived signal {signum} again. Exiting now")
+            sys.stdout.flush()
+            # Busy worker threads would block SystemExit until they finish
+            os._exit(128 + signum)
+
         print(f"\n\nReceived signal {signum}. Shutting down gracefully...")
-        self.shutdown_requested = True
-        sys.exit(0)
+        # Let main() unwind normally so yt_dlp instances are closed cleanly
+        self.shutdown_event.set()
 
     def my_hook(self, d):
         """
-        Hook for finished downloads - set file permissions
+        Hook for download progress - abort in-flight downloads on shutdown
         """
-        if d["status"] == "finished":
+        if self.shutdown_event.is_set():
+            from yt_dlp.utils import DownloadCancelled
+
+            raise DownloadCancelled("Shutdown requested")
+
+        if d["status"] == "finished" and not self.cm.get_quiet():
             print("Done downloading, now converting ...")
-            # Set world read/write permissions on the downloaded file
-            if 'filename' in d:
-                try:
-                    os.chmod(d['filename'], 0o666)  # rw-rw-rw-
-                except Exception as e:
-                    print(f"Warning: Could not set permissions on {d['filename']}: {e}")
+
+    def pp_hook(self, d):
+        """
+        Hook for finished postprocessing - record newly archived MP3s
+
+        The MoveFiles postprocessor runs last, so its info_dict holds the
+        final path after any audio conversion.
+        """
+        from yt_dlp.postprocessor import MoveFilesAfterDownloadPP
+
+        if d["status"] == "finished" and d.get("postprocessor") == MoveFilesAfterDownloadPP.pp_key():
+            filepath = d["info_dict"].get("filepath")
+            if filepath and filepath.endswith(".mp3"):
+                self._new_mp3s.append(filepath)
 
     def boot_sequence(self):
         """
         Prints title + logo
         """
-        print()
-        print(self.PRGM_TITLE)
-        print(logos.BOOT_LOGO_80)
-        print("\nStarting automated archive client")
+        sys.stdout.write(f"\n{self.PRGM_TITLE}\n{logos.BOOT_LOGO_80}\n\nStarting automated archive client\n")
 
     def download_from_url(self, ytdl, url):
         """
         Download all relevant media from url
 
         Skips media that has already been downloaded
+        Returns True if the download failed because of rate limiting
         """
+        if not self.cm.get_quiet():
+            print(f"\n######\n[URL] -- {url}\n")
+
+        # ignoreerrors covers per-video failures inside yt-dlp. This only
+        # catches what escapes it (cancellation on shutdown, internal yt-dlp
+        # errors) so one bad url cannot stop the whole pass.
         try:
             # Let yt-dlp handle everything including duplicate detection
             ytdl.download([url])
         except Exception as e:
             print(f"\nError occurred on page: {url}\n{e}\n")
+            return self.YTDLLogger.RATE_LIMIT_MARKER in str(e)
+        return False
+
+    def wait_for_backoff(self):
+        """
+        Block until the shared rate limit backoff window has passed
+
+        Returns early if shutdown is requested
+        """
+        while True:
+            with self._backoff_lock:
+                remaining = self._backoff_until - time.monotonic()
+            if remaining <= 0 or self.shutdown_event.wait(timeout=remaining):
+                return
+
+    def update_backoff(self, rate_limited, started):
+        """
+        Adjust the shared rate limit backoff after a url completes
+
+        A rate limited url opens a backoff window of the current delay plus
+        jitter that every worker waits out, then doubles the delay. Further
+        429s inside an open window come from requests already in flight and
+        do not extend it. Successful urls halve the delay, but only if they
+        started after the last window closed.
+        """
+        with self._backoff_lock:
+            now = time.monotonic()
+            if not rate_limited:
+                if started >= self._backoff_until:
+                    self._backoff_s = max(self.MIN_BACKOFF, self._backoff_s * 0.5)
+                return
+            if now < self._backoff_until:
+                return
+            delay = self._backoff_s + random.uniform(0, self._backoff_s / 2)
+            self._backoff_until = now + delay
+            self._backoff_s = min(self.MAX_BACKOFF, self._backoff_s * 2)
+
+        print(f"\nRate limited - backing off for {delay:.1f}s")
+
+    def _download_one(self, ytdl_opts, url):
+        """
+        Download all media from url using a dedicated yt_dlp instance
+
+        YoutubeDL is not thread safe, so every url gets its own instance and
+        logger rather than sharing one across worker threads. The download
+        archive in ytdl_opts is shared, so workers see each other's downloads.
+        """
+        # Imported here since yt_dlp loads hundreds of extractor modules
+        import yt_dlp
+
+        # Hold off while any worker's rate limit backoff is active
+        self.wait_for_backoff()
+        if self.shutdown_event.is_set():
+            return
+
+        started = time.monotonic()
+        logger = self.YTDLLogger(quiet=self.cm.get_quiet())
+
+        # yt_dlp reads cookies.txt lazily and rewrites it on close, so load it
+        # up front and save it under a lock to keep workers from reading a
+        # half written file
+        with self._cookie_lock:
+            ytdl = yt_dlp.YoutubeDL({**ytdl_opts, "logger": logger})
+            if ytdl_opts.get("cookiefile"):
+                from yt_dlp.cookies import CookieLoadError
+
+                try:
+                    ytdl.cookiejar
+                except CookieLoadError:
+                    # Already reported through the logger
+                    return
+
+        try:
+            # Download all media from url
+            rate_limited = self.download_from_url(ytdl, url)
+
+            # List all downloads available from url
+            # self.extract_info_url(ytdl, url)
+        finally:
+            with self._cookie_lock:
+                ytdl.close()
+
+        self.update_backoff(rate_limited or logger.rate_limited, started)
 
     def extract_info_url(self, ytdl, url):
         """
@@ -118,72 +308,103 @@ class JDAE(object):
         except:
             print(f"\nError occurred on page: {url}\n")
 
-    def fix_id3_tags(self, output_dir, album_artist_override, since_time=None):
+    def fix_id3_tags(self, files, album_artist_override):
         """
         Fix ID3 tags on MP3 files to ensure Album Artist is set correctly.
         This runs outside of yt-dlp to ensure the tags are properly set.
 
         Args:
-            output_dir: Base directory to search for MP3 files
+            files: MP3 paths to process, as recorded by pp_hook
             album_artist_override: Value to set for Album Artist field
-            since_time: Only process files modified after this timestamp (optional)
         """
         if not album_artist_override:
             return
 
-        print(f"\nFixing ID3 tags - ensuring Album Artist is set to: {album_artist_override}")
+        # Imported here so startup does not pay for mutagen until tags are fixed
+        from mutagen.id3 import ID3, ID3NoHeaderError, TPE2
 
-        # Find all MP3 files in the output directory
-        mp3_pattern = os.path.join(output_dir, "**", "*.mp3")
-        mp3_files = glob.glob(mp3_pattern, recursive=True)
+        print(f"\nFixing ID3 tags - ensuring Album Artist is set to: {album_artist_override}")
 
-        files_processed = 0
-        files_updated = 0
+        # The Album Artist (TPE2) frame is identical for every file. Mutagen only
+        # reads frames when saving, so one instance can be shared by all tags.
+        tpe2_frame = TPE2(encoding=3, text=album_artist_override)
+        quiet = self.cm.get_quiet()
 
-        for mp3_file in mp3_files:
-            # Skip if we have a time filter and file is too old
-            if since_time and os.path.getmtime(mp3_file) < since_time:
-                continue
+        def _fix_one(mp3_file):
+            """
+            Fix the Album Artist tag on one file
 
+            Returns (processed, updated) counts for this file
+            """
             try:
-                # Load the MP3 file
-                audio = MP3(mp3_file, ID3=ID3)
-
-                # Check if ID3 tags exist, create if not
-                if audio.tags is None:
-                    audio.add_tags()
+                # Load only the ID3 tag - the MPEG stream is not needed
+                try:
+                    tags = ID3(mp3_file)
+                except ID3NoHeaderError:
+                    tags = ID3()
 
                 # Get current album artist value
                 current_album_artist = None
-                if 'TPE2' in audio.tags:
-                    current_album_artist = str(audio.tags['TPE2'])
+                if 'TPE2' in tags:
+                    current_album_artist = str(tags['TPE2'])
 
                 # Only update if different
+                updated = 0
                 if current_album_artist != album_artist_override:
                     # Set the Album Artist (TPE2 frame)
-                    audio.tags['TPE2'] = TPE2(encoding=3, text=album_artist_override)
-                    audio.save()
-                    files_updated += 1
-                    print(f"  Updated: {os.path.basename(mp3_file)}")
+                    tags['TPE2'] = tpe2_frame
+                    tags.save(mp3_file)
+                    updated = 1
+                    if not quiet:
+                        print(f"  Updated: {os.path.basename(mp3_file)}")
 
-                files_processed += 1
+                return 1, updated
 
             except Exception as e:
                 print(f"  Warning: Could not update ID3 tags for {mp3_file}: {e}")
+                return 0, 0
+
+        # Tag rewrites are blocking disk I/O, so overlap them across a few threads
+        files_processed = 0
+        files_updated = 0
+        with ThreadPoolExecutor(max_workers=self.ID3_WORKERS) as executor:
+            for processed, updated in executor.map(_fix_one, files):
+                files_processed += processed
+                files_updated += updated
 
         if files_processed > 0:
             print(f"\nID3 tag fixing complete: Processed {files_processed} files, updated {files_updated} files")
 
+    def make_private_dir(self, path):
+        """
+        Create directory path accessible only by its owner
+
+        Tightens an existing directory if it is open to other users. Failing
+        to do so (e.g. it belongs to another user) only prints a warning.
+        """
+        try:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if path.stat().st_mode & 0o077:
+                os.chmod(path, 0o700)
+        except OSError as e:
+            print(f"Warning: Could not restrict permissions on {path}: {e}")
+
     def main(self):
         """
         Main JDAE program logic. Starts up and runs archive automation.
         """
+        # Create media files and folders world read/write (rw-rw-rw- for
+        # files) so yt-dlp and ffmpeg output needs no chmod afterwards. The
+        # archive file and yt-dlp cache set their own permissions below.
+        os.umask(0o000)
+
         # Read settings and url list from config files
         url_list = self.cm.get_url_list()
         output_dir = self.cm.get_output_dir()
         archive_wait_time = self.cm.get_archive_freq()
         oauth = self.cm.get_oauth()
         req_int = self.cm.get_sleep_interval_requests()
+        max_workers = self.cm.get_max_workers()
         list_formats = self.cm.get_listformats()
         embed_metadata = self.cm.get_embed_metadata()
         album_artist_override = self.cm.get_album_artist_override()
@@ -192,10 +413,8 @@ class JDAE(object):
         if not self.cm.get_skip_intro():
             self.boot_sequence()
 
-        # Print list of pages to user that will be processed
-        print("\nMonitoring the following pages:")
-        for url in url_list:
-            print(f" - {url}")
+        # Print list of pages to user that will be processed in a single write
+        sys.stdout.write("\nMonitoring the following pages:\n" + "".join(f" - {url}\n" for url in url_list))
 
         # Construct output path template
         # Use playlist/album name if available, otherwise use 'tracks' for individual tracks
@@ -203,28 +422,23 @@ class JDAE(object):
         outtmpl = f"{output_dir}/%(playlist,playlist_title,uploader,channel|tracks)s/{self.OUTPUT_FILE_TMPL}"
         print(f"\n######\nARCHIVE OUTPUT DIRECTORY: {output_dir}")
         
+        # Resolve files kept in the archive directory once
+        output_path = Path(output_dir)
+        self._cookies_path = output_path / "cookies.txt"
+        self._archive_path = output_path / "download_archive.txt"
+        self._cache_path = output_path / ".yt_dlp_cache"
+
+        # The cache holds player code yt-dlp executes. Keep it private, since
+        # yt-dlp creates its subdirectories world writable under the umask.
+        self.make_private_dir(self._cache_path)
+
         # Check for cookies.txt file in archive directory
-        cookies_file = os.path.join(output_dir, "cookies.txt")
-        if os.path.exists(cookies_file):
+        has_cookies = self._cookies_path.is_file()
+        if has_cookies:
             print(f"Found cookies.txt - will use for authenticated downloads")
-        else:
-            cookies_file = None
-
-        if self.cm.get_hq_en():
-            # Set header for HD Soundcould Downloads
-            yt_dlp.utils.std_headers["Authorization"] = oauth
 
         # Build parse_metadata list based on configuration
-        parse_metadata = [
-            # Artist is always the track uploader/creator
-            "%(artist|creator|uploader|uploader_id)s:%(artist)s",
-            # Map playlist name to album field
-            "%(playlist|playlist_title)s:%(album)s",
-            # Map description to comment field
-            "%(description)s:%(comment)s",
-            # Map the original webpage URL to author URL field
-            "%(webpage_url)s:%(author_url)s",
-        ]
+        parse_metadata = list(self._BASE_PARSE_METADATA)
         
         # Add album artist mapping
         if album_artist_override:
@@ -234,95 +448,75 @@ class JDAE(object):
             # Use playlist creator or fall back to track uploader
             parse_metadata.append("%(playlist_uploader|channel|uploader)s:%(album_artist)s")
         
+        # Load the download archive once rather than in every yt_dlp instance
+        archive = DownloadArchive(str(self._archive_path))
+
         # Options for yt_dlp instance
         ytdl_opts = {
-            "format": "ba[acodec!*=opus]",
-            "logger": self.YTDLLogger(),
+            **self._BASE_YTDL_OPTS,
             "outtmpl": outtmpl,
             "listformats": list_formats,
             "sleep_interval_requests": req_int,
             "progress_hooks": [self.my_hook],
-            "download_archive": os.path.join(output_dir, "download_archive.txt"),  # Track downloaded videos
-            "ignoreerrors": True,  # Continue on download errors
+            "postprocessor_hooks": [self.pp_hook],
+            # Track downloaded videos in one archive shared by all workers
+            "download_archive": archive,
+            "match_filter": archive.match_filter,
             "parse_metadata": parse_metadata,
+            "cachedir": str(self._cache_path),  # Persist player/signature cache on the archive volume
         }
+
+        if self.cm.get_hq_en():
+            # Set header for HD Soundcould Downloads
+            # Passed per instance rather than mutating yt_dlp's global std_headers
+            ytdl_opts["http_headers"] = {"Authorization": oauth}
         
         # Add cookies file if present
-        if cookies_file:
-            ytdl_opts["cookiefile"] = cookies_file
+        if has_cookies:
+            ytdl_opts["cookiefile"] = str(self._cookies_path)
         
         # Add metadata embedding options if enabled
         if embed_metadata:
             # Convert to mp3 format when metadata embedding is enabled for better compatibility
             ytdl_opts["writethumbnail"] = True
-            ytdl_opts["postprocessors"] = [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "0",  # 0 means best quality (VBR)
-                },
-                {
-                    "key": "FFmpegMetadata",
-                    "add_metadata": True,
-                },
-                {
-                    "key": "EmbedThumbnail",
-                    "already_have_thumbnail": False,
-                },
-                {
-                    "key": "Exec",
-                    "exec_cmd": "chmod 666 {}",  # Set world read/write after processing
-                    "when": "after_move"
-                },
-            ]
+            ytdl_opts["postprocessors"] = list(self._PP_MP3)
             print("\nMetadata embedding enabled - converting to mp3 with album art and ID3 tags")
-        else:
-            # Even without metadata, ensure proper permissions
-            ytdl_opts["postprocessors"] = [
-                {
-                    "key": "Exec",
-                    "exec_cmd": "chmod 666 {}",  # Set world read/write after download
-                    "when": "after_move"
-                },
-            ]
 
         # Time to get started
         print("\nEngine ready - good luck")
         time.sleep(2)
         try:
-            with yt_dlp.YoutubeDL(ytdl_opts) as ytdl:
-                while not self.shutdown_requested:
-                    # Track the start time of this archive pass
-                    pass_start_time = time.time()
-
-                    # For every url in the url_list.ini run yt_dlp operation
-                    for url in url_list:
-                        if self.shutdown_requested:
-                            break
-                        print(f"\n######\n[URL] -- {url}\n")
-
-                        # Download all media from url
-                        self.download_from_url(ytdl, url)
-
-                        # List all downloads available from url
-                        # self.extract_info_url(ytdl, url)
-
-                    if self.shutdown_requested:
-                        break
-
-                    # Fix ID3 tags on newly downloaded files
-                    # Only process files modified since the start of this pass
-                    self.fix_id3_tags(output_dir, album_artist_override, since_time=pass_start_time)
-
-                    print(
-                        f"\n######\nArchive pass completed. Will check again in {archive_wait_time}s ({archive_wait_time/3600}h)"
-                    )
-
-                    # Use shorter sleep intervals to check for shutdown
-                    # This allows for quicker response to shutdown signals
-                    wait_end = time.time() + archive_wait_time
-                    while time.time() < wait_end and not self.shutdown_requested:
-                        time.sleep(1)  # Check every second for shutdown
+            while not self.shutdown_event.is_set():
+                # Retry anything a worker claimed but failed to download last pass
+                archive.release_claims()
+
+                # Download every url in the url_list on a pool of worker threads
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [pool.submit(self._download_one, ytdl_opts, url) for url in url_list]
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    finally:
+                        # Don't start queued urls if the pass is being abandoned
+                        for future in futures:
+                            future.cancel()
+
+                if self.shutdown_event.is_set():
+                    break
+
+                # Fix ID3 tags on the files downloaded during this pass
+                # Nothing to do when the pass archived no new files
+                if self._new_mp3s:
+                    self.fix_id3_tags(self._new_mp3s, album_artist_override)
+                    self._new_mp3s.clear()
+
+                print(
+                    f"\n######\nArchive pass completed. Will check again in {archive_wait_time}s ({archive_wait_time/3600}h)"
+                )
+
+                # Sleep until the next pass, waking early on a shutdown signal
+                if self.shutdown_event.wait(timeout=archive_wait_time):
+                    break
         except Exception as e:
             print(f"\nError: {e}")
             traceback.print_exc()
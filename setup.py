@@ -7,7 +7,7 @@ setup(
     author_email="doit.jesss@gmail.com",
     description="Jess Doit's Archive Engine",
     url="https://github.com/Jess-Doit/jess-doit-archive-engine",
-    packages=find_namespace_packages(),
+    packages=find_namespace_packages(include=["jdae*"]),
     install_requires=["yt-dlp", "mutagen"],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,17 @@
+import signal
+
+import pytest
+
+from jdae.start_jdae import JDAE
+
+
+@pytest.fixture
+def jdae(monkeypatch):
+    """
+    JDAE instance whose signal handlers are restored after the test
+    """
+    monkeypatch.setenv("URL_LIST", "https://example.com")
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGINT)}
+    yield JDAE()
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
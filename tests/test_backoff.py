@@ -0,0 +1,45 @@
+import time
+
+
+def test_rate_limit_opens_shared_window(jdae):
+    jdae.update_backoff(True, time.monotonic())
+
+    assert jdae._backoff_until > time.monotonic()
+    assert jdae._backoff_s == 2 * jdae.MIN_BACKOFF
+
+
+def test_rate_limit_inside_window_does_not_extend_it(jdae):
+    jdae.update_backoff(True, time.monotonic())
+    until = jdae._backoff_until
+
+    jdae.update_backoff(True, time.monotonic())
+
+    assert jdae._backoff_until == until
+    assert jdae._backoff_s == 2 * jdae.MIN_BACKOFF
+
+
+def test_success_started_during_window_keeps_delay(jdae):
+    started = time.monotonic()
+    jdae.update_backoff(True, started)
+
+    jdae.update_backoff(False, started)
+
+    assert jdae._backoff_s == 2 * jdae.MIN_BACKOFF
+
+
+def test_success_after_window_halves_delay(jdae):
+    jdae._backoff_s = 4 * jdae.MIN_BACKOFF
+
+    jdae.update_backoff(False, time.monotonic())
+
+    assert jdae._backoff_s == 2 * jdae.MIN_BACKOFF
+
+
+def test_wait_for_backoff_returns_on_shutdown(jdae):
+    jdae._backoff_until = time.monotonic() + 60
+    jdae.shutdown_event.set()
+
+    start = time.monotonic()
+    jdae.wait_for_backoff()
+
+    assert time.monotonic() - start < 1
@@ -0,0 +1,43 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from yt_dlp.cookies import YoutubeDLCookieJar
+
+COOKIES = "# Netscape HTTP Cookie File\n.example.com\tTRUE\t/\tFALSE\t0\tsession\tabc\n"
+
+
+def test_workers_do_not_load_and_save_cookies_concurrently(jdae, tmp_path, monkeypatch):
+    cookies = tmp_path / "cookies.txt"
+    cookies.write_text(COOKIES, encoding="utf-8")
+
+    lock = threading.Lock()
+    active = []
+    overlaps = []
+
+    def track(method):
+        def wrapper(self, *args, **kwargs):
+            with lock:
+                active.append(method.__name__)
+                overlaps.append(len(active))
+            try:
+                # Widen the window another worker could race into
+                time.sleep(0.05)
+                return method(self, *args, **kwargs)
+            finally:
+                with lock:
+                    active.remove(method.__name__)
+        return wrapper
+
+    monkeypatch.setattr(YoutubeDLCookieJar, "load", track(YoutubeDLCookieJar.load))
+    monkeypatch.setattr(YoutubeDLCookieJar, "save", track(YoutubeDLCookieJar.save))
+    monkeypatch.setattr(jdae, "download_from_url", lambda ytdl, url: False)
+
+    opts = {"cookiefile": str(cookies), "quiet": True}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for future in [pool.submit(jdae._download_one, opts, url) for url in ("a", "b")]:
+            future.result()
+
+    assert len(overlaps) == 4
+    assert max(overlaps) == 1
+    assert "session\tabc" in cookies.read_text(encoding="utf-8")
@@ -0,0 +1,72 @@
+import os
+import stat
+
+from yt_dlp import YoutubeDL
+
+from jdae.src.downloadarchive import DownloadArchive
+
+TRACK = {"id": "1234", "extractor_key": "Soundcloud"}
+
+
+def test_loads_existing_ids(tmp_path):
+    path = tmp_path / "download_archive.txt"
+    path.write_text("soundcloud 1\n\nyoutube abc\n", encoding="utf-8")
+
+    assert DownloadArchive(str(path)) == {"soundcloud 1", "youtube abc"}
+
+
+def test_recording_is_shared_between_instances(tmp_path):
+    path = tmp_path / "download_archive.txt"
+    archive = DownloadArchive(str(path))
+
+    with YoutubeDL({"download_archive": archive, "quiet": True}) as first, \
+            YoutubeDL({"download_archive": archive, "quiet": True}) as second:
+        assert not second.in_download_archive(TRACK)
+        first.record_download_archive(TRACK)
+        assert second.in_download_archive(TRACK)
+
+    assert path.read_text(encoding="utf-8") == "soundcloud 1234\n"
+
+
+def test_match_filter_lets_one_worker_claim_an_entry(tmp_path):
+    archive = DownloadArchive(str(tmp_path / "download_archive.txt"))
+
+    # Flat playlist entries are never claimed
+    assert archive.match_filter(TRACK, incomplete=True) is None
+
+    assert archive.match_filter(TRACK) is None
+    assert archive.match_filter(TRACK) is not None
+
+    archive.release_claims()
+    assert archive.match_filter(TRACK) is None
+
+
+def test_add_releases_claim(tmp_path):
+    archive = DownloadArchive(str(tmp_path / "download_archive.txt"))
+
+    archive.match_filter(TRACK)
+    archive.add("soundcloud 1234")
+    archive.release_claims()
+
+    assert archive.match_filter(TRACK) is not None
+
+
+def test_new_archive_file_is_not_world_writable(tmp_path):
+    path = tmp_path / "download_archive.txt"
+    old_umask = os.umask(0)
+    try:
+        DownloadArchive(str(path)).add("soundcloud 1")
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(path.stat().st_mode) == DownloadArchive.FILE_MODE
+
+
+def test_existing_archive_file_keeps_its_mode(tmp_path):
+    path = tmp_path / "download_archive.txt"
+    path.write_text("soundcloud 1\n", encoding="utf-8")
+    path.chmod(0o664)
+
+    DownloadArchive(str(path)).add("soundcloud 2")
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o664
@@ -0,0 +1,19 @@
+from mutagen.id3 import ID3, TPE2
+
+
+def test_sets_album_artist_on_given_files(jdae, tmp_path):
+    tagged = tmp_path / "tagged.mp3"
+    tagged.write_bytes(b"")
+    tags = ID3()
+    tags["TPE2"] = TPE2(encoding=3, text="Someone Else")
+    tags.save(str(tagged))
+    untagged = tmp_path / "untagged.mp3"
+    untagged.write_bytes(b"")
+    skipped = tmp_path / "skipped.mp3"
+    skipped.write_bytes(b"")
+
+    jdae.fix_id3_tags([str(tagged), str(untagged)], "Jess")
+
+    assert str(ID3(str(tagged))["TPE2"]) == "Jess"
+    assert str(ID3(str(untagged))["TPE2"]) == "Jess"
+    assert skipped.read_bytes() == b""
@@ -0,0 +1,34 @@
+import os
+import stat
+
+
+def test_creates_private_dir(jdae, tmp_path):
+    cache = tmp_path / "archive" / ".yt_dlp_cache"
+
+    jdae.make_private_dir(cache)
+
+    assert stat.S_IMODE(cache.stat().st_mode) == 0o700
+
+
+def test_tightens_existing_dir(jdae, tmp_path):
+    cache = tmp_path / ".yt_dlp_cache"
+    cache.mkdir()
+    cache.chmod(0o777)
+
+    jdae.make_private_dir(cache)
+
+    assert stat.S_IMODE(cache.stat().st_mode) == 0o700
+
+
+def test_warns_when_dir_cannot_be_tightened(jdae, tmp_path, monkeypatch, capsys):
+    cache = tmp_path / ".yt_dlp_cache"
+    cache.mkdir()
+    cache.chmod(0o777)
+
+    def chmod(path, mode):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, "chmod", chmod)
+    jdae.make_private_dir(cache)
+
+    assert "Warning: Could not restrict permissions" in capsys.readouterr().out
@@ -0,0 +1,29 @@
+from yt_dlp import YoutubeDL
+from yt_dlp.postprocessor import MoveFilesAfterDownloadPP
+
+
+def run_move_files(jdae, filepath):
+    """
+    Run yt_dlp's MoveFiles postprocessor on filepath with pp_hook registered
+    """
+    info = {"filepath": str(filepath), "__files_to_move": {}}
+    with YoutubeDL({"postprocessor_hooks": [jdae.pp_hook], "quiet": True}) as ydl:
+        ydl.run_pp(MoveFilesAfterDownloadPP(ydl), info)
+
+
+def test_pp_hook_records_moved_mp3(jdae, tmp_path):
+    track = tmp_path / "track.mp3"
+    track.write_bytes(b"")
+
+    run_move_files(jdae, track)
+
+    assert jdae._new_mp3s == [str(track)]
+
+
+def test_pp_hook_ignores_other_formats(jdae, tmp_path):
+    track = tmp_path / "track.m4a"
+    track.write_bytes(b"")
+
+    run_move_files(jdae, track)
+
+    assert jdae._new_mp3s == []
@@ -0,0 +1,27 @@
+import os
+import signal
+
+import pytest
+
+
+class ForcedExit(Exception):
+    pass
+
+
+def test_first_signal_requests_shutdown(jdae):
+    jdae.signal_handler(signal.SIGINT, None)
+
+    assert jdae.shutdown_event.is_set()
+
+
+def test_second_signal_exits_immediately(jdae, monkeypatch):
+    def _exit(status):
+        raise ForcedExit(status)
+
+    monkeypatch.setattr(os, "_exit", _exit)
+    jdae.signal_handler(signal.SIGINT, None)
+
+    with pytest.raises(ForcedExit) as excinfo:
+        jdae.signal_handler(signal.SIGINT, None)
+
+    assert excinfo.value.args == (128 + signal.SIGINT,)
@@ -0,0 +1,20 @@
+from jdae.start_jdae import JDAE
+
+
+def test_debug_prints_download_lines(capsys):
+    logger = JDAE.YTDLLogger()
+
+    logger.debug("[download] Destination: track.mp3")
+    logger.debug("[download] 100% of 1.00MiB")
+
+    assert capsys.readouterr().out == "[download] Destination: track.mp3\n[download] 100% of 1.00MiB\n"
+
+
+def test_quiet_hides_download_lines(capsys):
+    logger = JDAE.YTDLLogger(quiet=True)
+
+    logger.debug("[download] Destination: track.mp3")
+    logger.warning("HTTP Error 429: Too Many Requests")
+
+    assert capsys.readouterr().out == "Warning: HTTP Error 429: Too Many Requests\n"
+    assert logger.rate_limited